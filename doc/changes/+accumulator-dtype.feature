@@ -0,0 +1 @@
+Add the accumulator_dtype option to mcsolve, nm_mcsolve and the stochastic solvers, to accumulate the trajectory averages in a lower precision such as np.complex64.
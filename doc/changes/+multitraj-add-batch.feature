@@ -0,0 +1 @@
+Add MultiTrajResult.partial_result and MultiTrajResult.add_batch, to reduce trajectories into separate results in threads and merge them.
@@ -0,0 +1,33 @@
+"""
+Kernels compiled with numba for the reductions of multi-trajectory results.
+
+Importing numba is slow, so this module is only imported by
+:mod:`qutip.solver.result` the first time a kernel is needed.
+"""
+import numba
+
+__all__ = ["welford_update", "update_trace"]
+
+
+# Cached to disk to only compile once, and releasing the GIL so threads
+# adding trajectories, see ``MultiTrajResult.add_batch``, run in parallel.
+@numba.njit(fastmath=True, cache=True, nogil=True)
+def welford_update(mean, M2, x, n):
+    # Single pass over the samples: each element of ``x`` is read once
+    # while both accumulators are updated.
+    for i in range(mean.shape[0]):
+        for j in range(mean.shape[1]):
+            delta = x[i, j] - mean[i, j]
+            M2[i, j] += (
+                (delta.real * delta.real + delta.imag * delta.imag)
+                * ((n - 1) / n)
+            )
+            mean[i, j] += delta / n
+
+
+@numba.njit(fastmath=True, cache=True, nogil=True)
+def update_trace(mean, M2, trace, n):
+    for i in range(mean.shape[0]):
+        delta = trace[i] - mean[i]
+        mean[i] += delta / n
+        M2[i] += delta * (trace[i] - mean[i])
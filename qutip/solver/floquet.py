@@ -563,6 +563,7 @@ def fsesolve(H, psi0, tlist, e_ops=None, T=0.0, args=None, options=None):
     for t in tlist:
         state_t = floquet_basis.from_floquet_basis(f_coeff, t)
         result.add(t, state_t)
+    result._finalize()
 
     return result
 
@@ -932,6 +933,7 @@ class FMESolver(MESolver):
         for t, state in self._integrator.run(tlist):
             progress_bar.update()
             results.add(t, self._restore_state(state, copy=False))
+        results._finalize()
         progress_bar.finished()
 
         stats["run time"] = progress_bar.total_time()
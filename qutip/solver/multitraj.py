@@ -66,6 +66,7 @@ class MultiTrajSolver(Solver):
         "mpi_options": {},
         "num_cpus": None,
         "bitgenerator": None,
+        "accumulator_dtype": None,
     }
 
     def __init__(self, rhs, *, options=None):
@@ -251,6 +252,7 @@ class MultiTrajSolver(Solver):
     def _integrate_one_traj(self, seed, tlist, result):
         for t, state in self._integrator.run(tlist):
             result.add(t, self._restore_state(state, copy=False))
+        result._finalize()
         return seed, result
 
     def _read_seed(self, seed, ntraj):
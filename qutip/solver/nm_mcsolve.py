@@ -334,6 +334,7 @@ class NonMarkovianMCSolver(MCSolver):
         "mpi_options": {},
         "num_cpus": None,
         "bitgenerator": None,
+        "accumulator_dtype": None,
         "method": "adams",
         "mc_corr_eps": 1e-10,
         "norm_steps": 5,
@@ -583,6 +584,12 @@ class NonMarkovianMCSolver(MCSolver):
             Which of numpy.random's bitgenerator to use. With ``None``, your
             numpy version's default is used.
 
+        accumulator_dtype: {None, numpy dtype}, default: None
+            Precision used to accumulate the average states, expectation
+            values and trace over the trajectories, e.g. ``np.complex64`` for
+            single precision. With ``None``, the type of the trajectories'
+            data is used. The averages are returned in double precision.
+
         mc_corr_eps: float, default: 1e-10
             Small number used to detect non-physical collapse caused by
             numerical imprecision.
@@ -133,6 +133,7 @@ def ttmsolve(dynmaps, state0, times, e_ops=(), num_learning=0, options=None):
         # Append state to all states
         states.append(state)
         results.add(times[n], restore(state))
+    results._finalize()
     end = time.time()
     stats["run time"] = end - start
 
@@ -1,8 +1,15 @@
 """ Class for solve function results"""
 
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import operator
+import os
 from typing import TypedDict
+import weakref
 import numpy as np
+from scipy.linalg.blas import get_blas_funcs
 from ..core import Qobj, QobjEvo, expect, isket, ket2dm, qzero_like
+from ..core import data as _data
 
 __all__ = [
     "Result",
@@ -14,6 +21,193 @@ __all__ = [
 ]
 
 
+def _abs2(x, out=None):
+    """
+    Square modulus of ``x``, without the square root taken by ``np.abs``.
+    """
+    if np.iscomplexobj(x):
+        out = np.multiply(x.real, x.real, out=out)
+        out += x.imag * x.imag
+        return out
+    return np.multiply(x, x, out=out)
+
+
+def _welford_update_numpy(mean, M2, x, n):
+    delta = x - mean
+    # ``M2 += |delta|**2 * (n-1)/n`` keeps ``M2`` real for complex samples.
+    M2 += _abs2(delta) * ((n - 1) / n)
+    mean += delta / n
+
+
+@functools.lru_cache(maxsize=None)
+def _numba_kernels():
+    """
+    Module of the numba kernels, or ``None`` when numba is not installed.
+    numba is only imported on the first call, not with qutip.
+    """
+    try:
+        from . import _result_kernels
+    except ImportError:
+        return None
+    return _result_kernels
+
+
+def _welford_update(mean, M2, x, n):
+    """
+    Update in place the running ``mean`` and sum of squared deviations ``M2``
+    with ``x``, the ``n``-th sample. All are arrays of shape
+    ``(num_e_ops, num_times)``, ``M2`` is real and sums ``|x - mean|**2``.
+    A fused kernel is used when numba is available.
+    """
+    kernels = _numba_kernels()
+    if (
+        kernels is not None
+        and mean.dtype in (np.float32, np.float64, np.complex64, np.complex128)
+        and np.can_cast(x.dtype, mean.dtype, "same_kind")
+    ):
+        kernels.welford_update(mean, M2, x.astype(mean.dtype, copy=False), n)
+    else:
+        _welford_update_numpy(mean, M2, x, n)
+
+
+def _update_trace_numpy(mean, M2, trace, n, buffers=None):
+    if buffers is None:
+        buffers = np.empty_like(mean), np.empty_like(M2)
+    delta, abs2 = buffers
+    # ``M2 += |delta|**2 * (n-1)/n`` is the same Welford update written with
+    # only in place operations.
+    np.subtract(trace, mean, out=delta)
+    _abs2(delta, out=abs2)
+    abs2 *= (n - 1) / n
+    M2 += abs2
+    delta /= n
+    mean += delta
+
+
+def _update_trace(mean, M2, trace, n, buffers=None):
+    """
+    Update in place the running ``mean`` and sum of squared deviations ``M2``
+    of the trace with ``trace``, the ``n``-th trajectory's trace. A fused
+    kernel is used when numba is available, otherwise ``buffers``, arrays
+    like ``mean`` and ``M2``, are used to hold the intermediate values.
+    """
+    kernels = _numba_kernels()
+    if (
+        kernels is not None
+        and mean.dtype in (np.float32, np.float64)
+        and M2.dtype == mean.dtype
+        and np.can_cast(trace.dtype, mean.dtype, "same_kind")
+    ):
+        trace = trace.astype(mean.dtype, copy=False)
+        kernels.update_trace(mean, M2, trace, n)
+    else:
+        _update_trace_numpy(mean, M2, trace, n, buffers)
+
+
+def _copy_accumulator(accu):
+    """
+    Copy an array, ``Qobj`` or list of ``Qobj`` accumulator, if set.
+    """
+    if accu is None:
+        return None
+    if isinstance(accu, list):
+        return [state.copy() for state in accu]
+    return accu.copy()
+
+
+def _add_projector(dm, ket):
+    """
+    Add ``|ket><ket|`` to the 2-D complex array ``dm`` in place with a rank-1
+    BLAS update, without creating the projector.
+    """
+    if dm.flags.f_contiguous:
+        geru = get_blas_funcs("geru", (dm,))
+        geru(1., ket, ket.conj(), a=dm, overwrite_a=True)
+    elif dm.flags.c_contiguous:
+        # The transpose of a C ordered array is fortran ordered.
+        geru = get_blas_funcs("geru", (dm.T,))
+        geru(1., ket.conj(), ket, a=dm.T, overwrite_a=True)
+    else:
+        dm += np.outer(ket, ket.conj())
+
+
+_COLLAPSE_DTYPE = np.dtype([("t", np.float64), ("which", np.intp)])
+
+
+def _split_collapses(collapse):
+    """
+    Times and ``c_ops`` indices of the ``(t, which)`` collapses of a run as
+    two arrays.
+    """
+    # The tuples are converted at once to records, each field keeping its
+    # type, then split into contiguous columns.
+    collapse = np.array(collapse, dtype=_COLLAPSE_DTYPE).reshape(-1)
+    return (
+        np.ascontiguousarray(collapse["t"]),
+        np.ascontiguousarray(collapse["which"]),
+    )
+
+
+def _is_uniform(tlist):
+    """
+    Whether the times in ``tlist`` are close enough to evenly spaced for a
+    time's interval to be found by rescaling, up to one interval.
+    """
+    tlist = np.asarray(tlist, dtype=np.float64)
+    num_bins = len(tlist) - 1
+    if num_bins < 1:
+        return False
+    dt = (tlist[-1] - tlist[0]) / num_bins
+    grid = tlist[0] + dt * np.arange(num_bins + 1)
+    return bool(dt > 0 and np.all(np.abs(tlist - grid) < 0.5 * dt))
+
+
+def _time_bins(times, tlist, uniform=None):
+    """
+    Index of the interval of ``tlist`` in which each of ``times`` falls, or
+    ``-1`` when outside of ``tlist``. Follows the ``np.histogram`` convention:
+    intervals include their left edge and the last one also its right edge.
+    ``uniform`` is the result of ``_is_uniform(tlist)``, if already known.
+    """
+    tlist = np.asarray(tlist, dtype=np.float64)
+    num_bins = len(tlist) - 1
+    if num_bins < 1 or len(times) == 0:
+        return np.full(len(times), -1, dtype=np.intp)
+    if uniform is None:
+        uniform = _is_uniform(tlist)
+    if uniform:
+        dt = (tlist[-1] - tlist[0]) / num_bins
+        # Uniform tlist: the bin is obtained by rescaling the times, rounding
+        # errors are then fixed by comparing with the edges, as np.histogram
+        # does for equal bins.
+        bins = ((times - tlist[0]) / dt).astype(np.intp)
+        np.clip(bins, 0, num_bins - 1, out=bins)
+        bins[times < tlist[bins]] -= 1
+        bins[(times >= tlist[bins + 1]) & (bins != num_bins - 1)] += 1
+    else:
+        bins = np.searchsorted(tlist, times, side="right") - 1
+        bins[times == tlist[-1]] = num_bins - 1
+    bins[(times < tlist[0]) | (times > tlist[-1])] = -1
+    return bins
+
+
+def _count_collapses(times, which, tlist, num_c_ops, uniform=None):
+    """
+    Number of collapses of each ``c_ops`` in each interval of ``tlist``, as
+    an array of shape ``(num_c_ops, len(tlist) - 1)``.
+    """
+    bins = _time_bins(times, tlist, uniform)
+    num_bins = max(len(tlist) - 1, 0)
+    in_range = (bins >= 0) & (which >= 0) & (which < num_c_ops)
+    if num_c_ops == 1:
+        # Common case of a single collapse operator: no offset is needed.
+        return np.bincount(bins[in_range], minlength=num_bins)[np.newaxis]
+    # All c_ops are counted at once by giving each its own range of bins.
+    flat_bins = which[in_range] * num_bins + bins[in_range]
+    counts = np.bincount(flat_bins, minlength=num_c_ops * num_bins)
+    return counts.reshape(num_c_ops, num_bins)
+
+
 class _QobjExpectEop:
     """
     Pickable e_ops callable that calculates the expectation value for a given
@@ -27,9 +221,49 @@ class _QobjExpectEop:
 
     def __init__(self, op):
         self.op = op
+        # The operator's data, hermiticity and space are read once instead of
+        # at each call to ``expect``.
+        self._op_data = op.data
+        self._op_isherm = op.isherm
+        self._op_space = op._dims[1] if op.isoper else None
 
     def __call__(self, t, state):
-        return expect(self.op, state)
+        if (
+            self._op_space is None
+            or not isinstance(state, Qobj)
+            or not (state.isket or state.isoper)
+            or state._dims[0] != self._op_space
+        ):
+            # Let ``expect`` handle other inputs and raise errors.
+            return expect(self.op, state)
+        # Specialisations of ``_data.expect`` compute the trace of the product
+        # without computing the full product.
+        out = _data.expect(self._op_data, state.data)
+        if (
+            self._op_isherm
+            and (state.isket or state.isherm)
+            and hasattr(out, "real")
+        ):
+            return out.real
+        return out
+
+
+# ``_QobjExpectEop`` of the operators currently in use, by ``id`` of the
+# operator. Entries are removed once the wrapper is no longer used, so the id
+# cannot be reused by another operator while in the cache.
+_EOP_CACHE = weakref.WeakValueDictionary()
+
+
+def _qobj_expect_eop(op):
+    """
+    Return the ``_QobjExpectEop`` of a :obj:`.Qobj` operator, reusing the one
+    of previous results, e.g. other trajectories, when possible.
+    """
+    e_op = _EOP_CACHE.get(id(op))
+    if e_op is None or e_op.op is not op or e_op._op_data is not op.data:
+        e_op = _QobjExpectEop(op)
+        _EOP_CACHE[id(op)] = e_op
+    return e_op
 
 
 class ExpectOp:
@@ -138,6 +372,10 @@ class Result(_BaseResult):
     """
     Base class for storing solver results.
 
+    States are added with :meth:`add` and may be views of the solver's
+    internal data. The final state is stored without a copy, so solvers must
+    call ``_finalize()`` once the last state has been added.
+
     Parameters
     ----------
     e_ops : :obj:`.Qobj`, :obj:`.QobjEvo`, function or list or dict of these
@@ -239,6 +477,7 @@ class Result(_BaseResult):
         self.times = []
         self.states = []
         self._final_state = None
+        self._final_state_copied = False
 
         self._post_init(**kw)
 
@@ -251,7 +490,7 @@ class Result(_BaseResult):
         in different ways.
         """
         if isinstance(e_op, Qobj):
-            return _QobjExpectEop(e_op)
+            return _qobj_expect_eop(e_op)
         elif isinstance(e_op, QobjEvo):
             return e_op.expect
         elif callable(e_op):
@@ -279,7 +518,9 @@ class Result(_BaseResult):
 
         store_final_state = self.options["store_final_state"]
         if store_final_state and not store_states:
-            self.add_processor(self._store_final_state, requires_copy=True)
+            # Only the last state is kept: it is copied once in ``_finalize``
+            # instead of copying every state added.
+            self.add_processor(self._store_final_state)
 
     def _store_state(self, t, state):
         """Processor that stores a state in ``.states``."""
@@ -288,6 +529,17 @@ class Result(_BaseResult):
     def _store_final_state(self, t, state):
         """Processor that writes the state to ``._final_state``."""
         self._final_state = state
+        self._final_state_copied = False
+
+    def _finalize(self):
+        """
+        Called by the solver once the last state has been added. The state
+        passed to ``.add`` may be a view on the solver's internal data, so the
+        final state is copied here since it is stored without a copy.
+        """
+        if self._final_state is not None and not self._final_state_copied:
+            self._final_state = self._pre_copy(self._final_state)
+            self._final_state_copied = True
 
     def _pre_copy(self, state):
         """Return a copy of the state. Sub-classes may override this to
@@ -460,16 +712,16 @@ class MultiTrajResult(_BaseResult):
         are the same as in that dictionary. Otherwise the keys are the index of
         the ``e_op`` in the ``.expect`` list.
 
-        The lists of expectation values returned are the *same* lists as
+        The arrays of expectation values returned are the *same* arrays as
         those returned by ``.expect``.
 
-    average_e_data : dict
+    std_e_data : dict
         A dictionary containing the standard derivation of each ``e_op`` over
         each trajectories. If the ``e_ops`` were supplied as a dictionary, the
         keys are the same as in that dictionary. Otherwise the keys are the
         index of the ``e_op`` in the ``.expect`` list.
 
-        The lists of expectation values returned are the *same* lists as
+        The arrays of expectation values returned are the *same* arrays as
         those returned by ``.expect``.
 
     runs_e_data : dict
@@ -496,6 +748,9 @@ class MultiTrajResult(_BaseResult):
 
     options: MultiTrajResultOptions
 
+    # Whether results can be merged with ``+``, used by ``add_batch``.
+    _mergeable = True
+
     def __init__(
         self,
         e_ops,
@@ -514,13 +769,17 @@ class MultiTrajResult(_BaseResult):
         self.seeds = []
 
         self._sum_states = None
+        self._states_dims = None
         self._sum_final_states = None
-        self._sum_expect = None
-        self._sum2_expect = None
+        self._mean_expect = None
+        self._M2_expect = None
         self._target_tols = None
 
-        self.average_e_data = {}
-        self.std_e_data = {}
+        self._expect_is_complex = []
+        self._expect_dirty = True
+        self._average_e_data = {}
+        self._std_e_data = {}
+
         self.runs_e_data = {}
 
         self._post_init(**kw)
@@ -546,6 +805,81 @@ class MultiTrajResult(_BaseResult):
             state = state.proj()
         return state
 
+    @classmethod
+    def _add_dm(cls, accu, state):
+        """
+        Add the density matrix of ``state`` to the accumulator ``accu`` in
+        place.
+        """
+        if state.isket and isinstance(accu.data, _data.Dense):
+            _add_projector(accu.data.as_ndarray(), state.full().ravel())
+            accu.isherm = None
+            return
+        dm = cls._to_dm(state)
+        if isinstance(accu.data, _data.Dense) and isinstance(
+            dm.data, _data.Dense
+        ):
+            _data.iadd_dense(accu.data, dm.data)
+        else:
+            accu.data = _data.add(accu.data, dm.data)
+        accu.isherm = None
+
+    def _zeros_states(self, states):
+        """
+        Create an accumulator for the sum of the density matrices of
+        ``states``. When all states are kets or square operators with the same
+        dimensions, it is a single array of shape ``(num_times, N, N)``,
+        otherwise a list of ``Qobj``.
+        """
+        first = states[0]
+        is_square = first.isoper and first.shape[0] == first.shape[1]
+        if (
+            (first.isket or is_square)
+            and all(state._dims == first._dims for state in states)
+        ):
+            self._states_dims = self._to_dm(first)._dims
+            N = states[0].shape[0]
+            dtype = self._accumulator_dtype(np.dtype(complex))
+            return np.zeros((len(states), N, N), dtype=dtype)
+        return [qzero_like(self._to_dm(state)) for state in states]
+
+    def _accumulator_dtype(self, dtype):
+        """
+        Type of the accumulator for data of type ``dtype``, with the precision
+        set by the ``accumulator_dtype`` option if given.
+        """
+        precision = self.options.get("accumulator_dtype", None)
+        if precision is None or dtype == object:
+            return dtype
+        if np.issubdtype(dtype, np.complexfloating):
+            return np.result_type(precision, np.complex64)
+        return np.finfo(precision).dtype
+
+    def _add_states(self, accu, states):
+        """
+        Add the density matrices of ``states`` to the accumulator ``accu`` in
+        place.
+        """
+        if isinstance(accu, list):
+            for accu_t, state in zip(accu, states):
+                self._add_dm(accu_t, state)
+        elif states[0].isket:
+            for dm, state in zip(accu, states):
+                _add_projector(dm, state.full().ravel())
+        else:
+            accu += np.stack([state.full() for state in states])
+
+    def _states_from_sum(self, accu, scale):
+        """
+        Density matrices ``scale * accu`` of a states accumulator.
+        """
+        if isinstance(accu, list):
+            return [state * scale for state in accu]
+        return [
+            Qobj(dm, dims=self._states_dims, copy=False)
+            for dm in accu * scale
+        ]
+
     def _add_first_traj(self, trajectory):
         """
         Read the first trajectory, intitializing needed data.
@@ -553,27 +887,27 @@ class MultiTrajResult(_BaseResult):
         self.times = trajectory.times
 
         if trajectory.states and self._store_average_density_matrices:
-            self._sum_states = [
-                qzero_like(self._to_dm(state)) for state in trajectory.states
-            ]
+            self._sum_states = self._zeros_states(trajectory.states)
 
         if trajectory.final_state and self._store_final_density_matrix:
             state = trajectory.final_state
             self._sum_final_states = qzero_like(self._to_dm(state))
 
-        self._sum_expect = [
-            np.zeros_like(expect) for expect in trajectory.expect
-        ]
-        self._sum2_expect = [
-            np.zeros_like(expect) for expect in trajectory.expect
+        # The running mean and sum of squared deviations (Welford's
+        # algorithm) of all e_ops are kept together in arrays of shape
+        # ``(num_e_ops, num_times)``. The squared deviations are moduli, so
+        # ``M2`` is real even for complex e_ops.
+        expects = trajectory.expect
+        self._expect_is_complex = [
+            np.iscomplexobj(expect) for expect in expects
         ]
+        dtype = self._accumulator_dtype(np.result_type(np.float64, *expects))
+        shape = (len(expects), len(self.times))
+        self._mean_expect = np.zeros(shape, dtype=dtype)
+        self._M2_expect = np.zeros(shape, dtype=np.finfo(dtype).dtype)
 
         self.e_ops = trajectory.e_ops
 
-        self.average_e_data = {
-            k: list(avg_expect)
-            for k, avg_expect in zip(self._raw_ops, self._sum_expect)
-        }
         if self.options["keep_runs_results"]:
             self.runs_e_data = {k: [] for k in self._raw_ops}
 
@@ -581,36 +915,57 @@ class MultiTrajResult(_BaseResult):
         self.trajectories.append(trajectory)
 
     def _reduce_states(self, trajectory):
-        self._sum_states = [
-            accu + self._to_dm(state)
-            for accu, state in zip(self._sum_states, trajectory.states)
-        ]
+        self._add_states(self._sum_states, trajectory.states)
 
     def _reduce_final_state(self, trajectory):
-        self._sum_final_states += self._to_dm(trajectory.final_state)
+        self._add_dm(self._sum_final_states, trajectory.final_state)
 
-    def _reduce_expect(self, trajectory):
+    @staticmethod
+    def _expect_array(trajectory):
         """
-        Compute the average of the expectation values and store it in it's
-        multiple formats.
+        Expectation values of the trajectory stacked in one array. They are
+        read from ``e_data`` since ``expect`` copies each e_op's values.
         """
-        for i, k in enumerate(self._raw_ops):
-            expect_traj = trajectory.expect[i]
+        return np.array(list(trajectory.e_data.values()))
 
-            self._sum_expect[i] += expect_traj
-            self._sum2_expect[i] += expect_traj**2
-
-            avg = self._sum_expect[i] / self.num_trajectories
-            avg2 = self._sum2_expect[i] / self.num_trajectories
+    def _reduce_expect(self, trajectory):
+        """
+        Update the running mean and sum of squared deviations of the
+        expectation values with those of the trajectory.
+        """
+        _welford_update(
+            self._mean_expect, self._M2_expect,
+            self._expect_array(trajectory), self.num_trajectories
+        )
+        self._expect_dirty = True
 
-            self.average_e_data[k] = list(avg)
+        if self.runs_e_data:
+            for k in self._raw_ops:
+                self.runs_e_data[k].append(trajectory.e_data[k])
 
-            # mean(expect**2) - mean(expect)**2 can something be very small
-            # negative (-1e-15) which raise an error for float sqrt.
-            self.std_e_data[k] = list(np.sqrt(np.abs(avg2 - np.abs(avg**2))))
+    def _expect_statistics(self):
+        """
+        Return the average and standard deviation of the expectation values
+        as arrays of shape ``(num_e_ops, num_times)``.
+        """
+        avg = self._mean_expect
+        var = self._M2_expect / self.num_trajectories
+        return avg, np.sqrt(var)
 
-            if self.runs_e_data:
-                self.runs_e_data[k].append(trajectory.e_data[k])
+    def _expect_to_dict(self, values):
+        """
+        Split an array of shape ``(num_e_ops, num_times)`` into a dictionary
+        using the ``e_ops`` keys. Real e_ops are returned as real arrays.
+        """
+        # Accumulators can be in single precision, results are not. The
+        # values are copied so the returned arrays don't change when more
+        # trajectories are added.
+        values = values.astype(np.result_type(values, np.float64))
+        return {
+            k: val if is_complex else np.real(val)
+            for k, val, is_complex
+            in zip(self._raw_ops, values, self._expect_is_complex)
+        }
 
     def _increment_traj(self, trajectory):
         if self.num_trajectories == 0:
@@ -634,9 +989,11 @@ class MultiTrajResult(_BaseResult):
         return ntraj_left
 
     def _average_computer(self):
-        avg = np.array(self._sum_expect) / self.num_trajectories
-        avg2 = np.array(self._sum2_expect) / self.num_trajectories
-        return avg, avg2
+        """
+        Average and variance of the expectation values used to estimate the
+        number of trajectories needed to reach the target tolerance.
+        """
+        return self._mean_expect, self._M2_expect / self.num_trajectories
 
     def _target_tolerance_end(self):
         """
@@ -646,14 +1003,11 @@ class MultiTrajResult(_BaseResult):
         """
         if self.num_trajectories <= 1:
             return np.inf
-        avg, avg2 = self._average_computer()
-        target = np.array(
-            [
-                atol + rtol * mean
-                for mean, (atol, rtol) in zip(avg, self._target_tols)
-            ]
-        )
-        target_ntraj = np.max((avg2 - abs(avg) ** 2) / target**2 + 1)
+        avg, var = self._average_computer()
+        atol = self._target_tols[:, 0:1]
+        rtol = self._target_tols[:, 1:2]
+        target = atol + rtol * avg
+        target_ntraj = np.max(var / target**2) + 1
 
         self._estimated_ntraj = min(target_ntraj, self._target_ntraj)
         if (self._estimated_ntraj - self.num_trajectories) <= 0:
@@ -710,6 +1064,83 @@ class MultiTrajResult(_BaseResult):
 
         return self._early_finish_check()
 
+    def add_batch(self, trajectories_info, num_threads=None):
+        """
+        Add multiple trajectories to the evolution.
+
+        The trajectories are split between partial results, see
+        :meth:`partial_result`, filled in parallel threads and then merged
+        into this result. The reductions are done by numpy or, for the mean
+        and variance when numba is installed, by kernels compiled without the
+        GIL, so threads help with large states or many times.
+
+        Parameters
+        ----------
+        trajectories_info : list of tuple of seed and trajectory
+            The trajectories to add, each as expected by :meth:`add`.
+
+        num_threads : int, optional
+            Number of threads to use. Defaults to the number of cpus.
+
+        Returns
+        -------
+        remaing_traj : number
+            Return the number of trajectories still needed to reach the target
+            tolerance, after adding all the trajectories. If no tolerance is
+            provided, return infinity.
+        """
+        trajectories_info = list(trajectories_info)
+        if num_threads is None:
+            num_threads = os.cpu_count() or 1
+        num_threads = min(num_threads, len(trajectories_info))
+        if num_threads <= 1 or not self._mergeable:
+            for trajectory_info in trajectories_info:
+                self.add(trajectory_info)
+            return self._early_finish_check()
+
+        # Contiguous chunks keep the order of the seeds and trajectories.
+        size = -(-len(trajectories_info) // num_threads)
+        chunks = [
+            trajectories_info[i:i + size]
+            for i in range(0, len(trajectories_info), size)
+        ]
+        partials = [self.partial_result() for _ in chunks]
+
+        def fill(partial, chunk):
+            for trajectory_info in chunk:
+                partial.add(trajectory_info)
+
+        with ThreadPoolExecutor(len(chunks)) as executor:
+            list(executor.map(fill, partials, chunks))
+
+        merged = self + functools.reduce(operator.add, partials)
+        merged._copy_into(self)
+        self.num_trajectories = merged.num_trajectories
+        self.seeds = merged.seeds
+        self._expect_dirty = True
+        return self._early_finish_check()
+
+    def partial_result(self):
+        """
+        Create an empty result with the same ``e_ops``, options and solver.
+
+        Adding trajectories is not thread-safe: the reduction of the states
+        and expectation values updates the accumulators in place. Workers
+        adding trajectories concurrently should each fill their own partial
+        result, which can then be merged with ``+``, e.g.
+        ``functools.reduce(operator.add, partials)``.
+
+        Returns
+        -------
+        partial : :class:`MultiTrajResult`
+            Empty result of the same class, without end condition.
+        """
+        stats = dict(self.stats)
+        stats["run time"] = 0
+        return self.__class__(
+            self._raw_ops, self.options, solver=self.solver, stats=stats
+        )
+
     def add_end_condition(self, ntraj, target_tol=None):
         """
         Set the condition to stop the computing trajectories when the certain
@@ -755,7 +1186,7 @@ class MultiTrajResult(_BaseResult):
         elif targets.shape == (2,):
             self._target_tols = np.ones((num_e_ops, 2)) * targets
         elif targets.shape == (num_e_ops, 2):
-            self._target_tols = targets
+            self._target_tols = targets.astype(float)
         else:
             raise ValueError(
                 "target_tol must be a number, a pair of (atol, "
@@ -769,8 +1200,9 @@ class MultiTrajResult(_BaseResult):
         """
         States of every runs as ``states[run][t]``.
         """
-        if self.trajectories and self.trajectories[0].states:
-            return [traj.states for traj in self.trajectories]
+        trajectories = self.trajectories
+        if trajectories and trajectories[0].states:
+            return [traj.states for traj in trajectories]
         else:
             return None
 
@@ -780,18 +1212,16 @@ class MultiTrajResult(_BaseResult):
         States averages as density matrices.
         """
         if self._sum_states is None:
-            if not (self.trajectories and self.trajectories[0].states):
+            trajectories = self.trajectories
+            if not (trajectories and trajectories[0].states):
                 return None
-            self._sum_states = [
-                qzero_like(self._to_dm(state))
-                for state in self.trajectories[0].states
-            ]
-            for trajectory in self.trajectories:
+            self._sum_states = self._zeros_states(trajectories[0].states)
+            for trajectory in trajectories:
                 self._reduce_states(trajectory)
 
-        return [
-            final / self.num_trajectories for final in self._sum_states
-        ]
+        return self._states_from_sum(
+            self._sum_states, 1 / self.num_trajectories
+        )
 
     @property
     def states(self):
@@ -805,8 +1235,9 @@ class MultiTrajResult(_BaseResult):
         """
         Last states of each trajectories.
         """
-        if self.trajectories and self.trajectories[0].final_state:
-            return [traj.final_state for traj in self.trajectories]
+        trajectories = self.trajectories
+        if trajectories and trajectories[0].final_state:
+            return [traj.final_state for traj in trajectories]
         else:
             return None
 
@@ -828,13 +1259,36 @@ class MultiTrajResult(_BaseResult):
         """
         return self.runs_final_states or self.average_final_state
 
+    def _update_expect_data(self):
+        """
+        Compute ``average_e_data`` and ``std_e_data`` from the sums if
+        trajectories were added since they were last computed.
+        """
+        if not self._expect_dirty:
+            return
+        if self.num_trajectories and self._raw_ops:
+            avg, std = self._expect_statistics()
+            self._average_e_data = self._expect_to_dict(avg)
+            self._std_e_data = self._expect_to_dict(std)
+        self._expect_dirty = False
+
+    @property
+    def average_e_data(self):
+        self._update_expect_data()
+        return self._average_e_data
+
+    @property
+    def std_e_data(self):
+        self._update_expect_data()
+        return self._std_e_data
+
     @property
     def average_expect(self):
-        return [np.array(val) for val in self.average_e_data.values()]
+        return [np.asarray(val) for val in self.average_e_data.values()]
 
     @property
     def std_expect(self):
-        return [np.array(val) for val in self.std_e_data.values()]
+        return [np.asarray(val) for val in self.std_e_data.values()]
 
     @property
     def runs_expect(self):
@@ -842,7 +1296,7 @@ class MultiTrajResult(_BaseResult):
 
     @property
     def expect(self):
-        return [np.array(val) for val in self.e_data.values()]
+        return [np.asarray(val) for val in self.e_data.values()]
 
     @property
     def e_data(self):
@@ -861,11 +1315,20 @@ class MultiTrajResult(_BaseResult):
         """
         N = int(N) or len(self.times)
         N = len(self.times) if N > len(self.times) else N
+        if isinstance(self._sum_states, np.ndarray):
+            # Sum the last times of the accumulator directly, only one
+            # ``Qobj`` is created.
+            steady = self._sum_states[-N:].sum(axis=0, keepdims=True)
+            return self._states_from_sum(
+                steady, 1 / (N * self.num_trajectories)
+            )[0]
         states = self.average_states
-        if states is not None:
-            return sum(states[-N:]) / N
-        else:
+        if states is None:
             return None
+        steady = qzero_like(states[-1])
+        for state in states[-N:]:
+            self._add_dm(steady, state)
+        return steady / N
 
     def __repr__(self):
         lines = [
@@ -900,29 +1363,71 @@ class MultiTrajResult(_BaseResult):
             return NotImplemented
         if self._raw_ops != other._raw_ops:
             raise ValueError("Shared `e_ops` is required to merge results")
-        if self.times != other.times:
+        if (
+            self.num_trajectories and other.num_trajectories
+            and self.times != other.times
+        ):
             raise ValueError("Shared `times` are is required to merge results")
 
         new = self.__class__(
-            self._raw_ops, self.options, solver=self.solver, stats=self.stats
+            self._raw_ops, self.options, solver=self.solver,
+            stats=dict(self.stats),
         )
-        new.e_ops = self.e_ops
+        new.num_trajectories = self.num_trajectories + other.num_trajectories
+        new.seeds = self.seeds + other.seeds
+        if self.num_trajectories and other.num_trajectories:
+            self._merge_into(new, other)
+        else:
+            # Merging with an empty result, such as an unused partial result.
+            (self if self.num_trajectories else other)._copy_into(new)
 
+        new._target_tols = None
+        new._expect_dirty = True
+        new.stats["run time"] = (
+            self.stats.get("run time", 0) + other.stats.get("run time", 0)
+        )
+        new.stats["end_condition"] = "Merged results"
+
+        return new
+
+    def _copy_into(self, new):
+        """
+        Set the data of the empty result ``new`` to copies of this result's.
+        """
+        new.e_ops = self.e_ops
+        new.times = self.times
+        new.trajectories = list(self.trajectories)
+        new._sum_states = _copy_accumulator(self._sum_states)
+        new._states_dims = self._states_dims
+        new._sum_final_states = _copy_accumulator(self._sum_final_states)
+        new._mean_expect = _copy_accumulator(self._mean_expect)
+        new._M2_expect = _copy_accumulator(self._M2_expect)
+        new._expect_is_complex = list(self._expect_is_complex)
+        new.runs_e_data = {k: list(v) for k, v in self.runs_e_data.items()}
+
+    def _merge_into(self, new, other):
+        """
+        Set the data of the empty result ``new`` to the merge of this result
+        with ``other``. Both must have trajectories.
+        """
+        new.e_ops = self.e_ops
+        new.times = self.times
         if self.trajectories and other.trajectories:
             new.trajectories = self.trajectories + other.trajectories
-        new.num_trajectories = self.num_trajectories + other.num_trajectories
-        new.times = self.times
-        new.seeds = self.seeds + other.seeds
 
         if (
             self._sum_states is not None
             and other._sum_states is not None
         ):
-            new._sum_states = [
-                state1 + state2 for state1, state2 in zip(
-                    self._sum_states, other._sum_states
-                )
-            ]
+            if isinstance(self._sum_states, list):
+                new._sum_states = [
+                    state1 + state2 for state1, state2 in zip(
+                        self._sum_states, other._sum_states
+                    )
+                ]
+            else:
+                new._sum_states = self._sum_states + other._sum_states
+                new._states_dims = self._states_dims
 
         if (
             self._sum_final_states is not None
@@ -932,33 +1437,26 @@ class MultiTrajResult(_BaseResult):
                 self._sum_final_states
                 + other._sum_final_states
             )
-        new._target_tols = None
-
-        new._sum_expect = []
-        new._sum2_expect = []
-        new.average_e_data = {}
-        new.std_e_data = {}
-
-        for i, k in enumerate(self._raw_ops):
-            new._sum_expect.append(self._sum_expect[i] + other._sum_expect[i])
-            new._sum2_expect.append(
-                self._sum2_expect[i] + other._sum2_expect[i]
-            )
 
-            avg = new._sum_expect[i] / new.num_trajectories
-            avg2 = new._sum2_expect[i] / new.num_trajectories
-
-            new.average_e_data[k] = list(avg)
-            new.std_e_data[k] = np.sqrt(np.abs(avg2 - np.abs(avg**2)))
+        # Combine the running means and squared deviations of both results
+        # (Chan et al. parallel variance algorithm).
+        delta = other._mean_expect - self._mean_expect
+        weight = other.num_trajectories / new.num_trajectories
+        new._mean_expect = self._mean_expect + delta * weight
+        new._M2_expect = (
+            self._M2_expect + other._M2_expect
+            + _abs2(delta) * self.num_trajectories * weight
+        )
+        new._expect_is_complex = [
+            self_complex or other_complex
+            for self_complex, other_complex
+            in zip(self._expect_is_complex, other._expect_is_complex)
+        ]
 
+        for k in self._raw_ops:
             if self.runs_e_data and other.runs_e_data:
                 new.runs_e_data[k] = self.runs_e_data[k] + other.runs_e_data[k]
 
-        new.stats["run time"] += other.stats["run time"]
-        new.stats["end_condition"] = "Merged results"
-
-        return new
-
 
 class McTrajectoryResult(Result):
     """
@@ -1013,53 +1511,92 @@ class McResult(MultiTrajResult):
 
     def _add_collapse(self, trajectory):
         self.collapse.append(trajectory.collapse)
+        # The times and indices are also kept as arrays, one per run, so
+        # that they are not transposed from the tuples at each use.
+        times, which = _split_collapses(trajectory.collapse)
+        self._col_t.append(times)
+        self._col_w.append(which)
+        self._col_version += 1
+
+    def _copy_into(self, new):
+        super()._copy_into(new)
+        new.collapse = list(self.collapse)
+        new._col_t = list(self._col_t)
+        new._col_w = list(self._col_w)
+        new._col_version += 1
+
+    def _merge_into(self, new, other):
+        super()._merge_into(new, other)
+        new.collapse = self.collapse + other.collapse
+        new._col_t = self._col_t + other._col_t
+        new._col_w = self._col_w + other._col_w
+        new._col_version += 1
 
     def _post_init(self):
         super()._post_init()
         self.num_c_ops = self.stats["num_collapse"]
         self.collapse = []
+        self._col_t = []
+        self._col_w = []
+        # ``col_times`` and ``col_which`` are cached until a collapse is added.
+        self._col_version = 0
+        self._col_cache_version = -1
+        self._col_times_cache = None
+        self._col_which_cache = None
+        self._uniform_tlist = None
         self.add_processor(self._add_collapse)
 
+    def _tlist_is_uniform(self):
+        """
+        Whether ``times`` is evenly spaced, checked once the times are known.
+        """
+        if self._uniform_tlist is None and self.num_trajectories:
+            self._uniform_tlist = _is_uniform(self.times)
+        return self._uniform_tlist
+
+    def _all_collapses(self):
+        """
+        Times and ``c_ops`` indices of the collapses of all runs.
+        """
+        if not self._col_t:
+            return np.zeros(0), np.zeros(0, dtype=np.intp)
+        return np.concatenate(self._col_t), np.concatenate(self._col_w)
+
+    def _update_col_cache(self):
+        if self._col_cache_version != self._col_version:
+            self._col_times_cache = [times.tolist() for times in self._col_t]
+            self._col_which_cache = [which.tolist() for which in self._col_w]
+            self._col_cache_version = self._col_version
+
     @property
     def col_times(self):
         """
         List of the times of the collapses for each runs.
         """
-        out = []
-        for col_ in self.collapse:
-            col = list(zip(*col_))
-            col = [] if len(col) == 0 else col[0]
-            out.append(col)
-        return out
+        self._update_col_cache()
+        return self._col_times_cache
 
     @property
     def col_which(self):
         """
         List of the indexes of the collapses for each runs.
         """
-        out = []
-        for col_ in self.collapse:
-            col = list(zip(*col_))
-            col = [] if len(col) == 0 else col[1]
-            out.append(col)
-        return out
+        self._update_col_cache()
+        return self._col_which_cache
 
     @property
     def photocurrent(self):
         """
         Average photocurrent or measurement of the evolution.
         """
-        cols = [[] for _ in range(self.num_c_ops)]
-        tlist = self.times
-        for collapses in self.collapse:
-            for t, which in collapses:
-                cols[which].append(t)
-        mesurement = [
-            np.histogram(cols[i], tlist)[0]
-            / np.diff(tlist)
-            / self.num_trajectories
-            for i in range(self.num_c_ops)
-        ]
+        tlist = np.asarray(self.times)
+        counts = _count_collapses(
+            *self._all_collapses(), tlist, self.num_c_ops,
+            self._tlist_is_uniform()
+        )
+        # The scaling is computed once and shared by all c_ops.
+        scale = 1.0 / np.diff(tlist) / self.num_trajectories
+        mesurement = list(counts * scale)
         return mesurement
 
     @property
@@ -1067,18 +1604,15 @@ class McResult(MultiTrajResult):
         """
         Photocurrent or measurement of each runs.
         """
-        tlist = self.times
+        tlist = np.asarray(self.times)
+        inv_dt = 1.0 / np.diff(tlist)
+        uniform = self._tlist_is_uniform()
         measurements = []
-        for collapses in self.collapse:
-            cols = [[] for _ in range(self.num_c_ops)]
-            for t, which in collapses:
-                cols[which].append(t)
-            measurements.append(
-                [
-                    np.histogram(cols[i], tlist)[0] / np.diff(tlist)
-                    for i in range(self.num_c_ops)
-                ]
+        for times, which in zip(self._col_t, self._col_w):
+            counts = _count_collapses(
+                times, which, tlist, self.num_c_ops, uniform
             )
+            measurements.append(list(counts * inv_dt))
         return measurements
 
 
@@ -1090,12 +1624,13 @@ class McResultImprovedSampling(McResult, MultiTrajResult):
     first and then only samples jump trajectories afterwards.
     """
 
+    _mergeable = False
+
     def __init__(self, e_ops, options, **kw):
         MultiTrajResult.__init__(self, e_ops=e_ops, options=options, **kw)
-        self._sum_expect_no_jump = None
-        self._sum_expect_jump = None
-        self._sum2_expect_no_jump = None
-        self._sum2_expect_jump = None
+        self._expect_no_jump = None
+        self._mean_expect_jump = None
+        self._M2_expect_jump = None
 
         self._sum_states_no_jump = None
         self._sum_states_jump = None
@@ -1106,130 +1641,116 @@ class McResultImprovedSampling(McResult, MultiTrajResult):
 
     def _reduce_states(self, trajectory):
         if self.num_trajectories == 1:
-            self._sum_states_no_jump = [
-                accu + self._to_dm(state)
-                for accu, state in zip(
-                    self._sum_states_no_jump, trajectory.states
-                )
-            ]
+            sum_states = self._sum_states_no_jump
         else:
-            self._sum_states_jump = [
-                accu + self._to_dm(state)
-                for accu, state in zip(
-                    self._sum_states_jump, trajectory.states
-                )
-            ]
+            sum_states = self._sum_states_jump
+        self._add_states(sum_states, trajectory.states)
 
     def _reduce_final_state(self, trajectory):
-        dm_final_state = self._to_dm(trajectory.final_state)
         if self.num_trajectories == 1:
-            self._sum_final_states_no_jump += dm_final_state
+            self._add_dm(self._sum_final_states_no_jump,
+                         trajectory.final_state)
         else:
-            self._sum_final_states_jump += dm_final_state
+            self._add_dm(self._sum_final_states_jump, trajectory.final_state)
 
     def _average_computer(self):
-        avg = np.array(self._sum_expect_jump) / (self.num_trajectories - 1)
-        avg2 = np.array(self._sum2_expect_jump) / (self.num_trajectories - 1)
-        return avg, avg2
+        """
+        Average and variance of the weighted jump trajectories used to
+        estimate the number of trajectories needed to reach the target
+        tolerance.
+        """
+        p = self.no_jump_prob
+        mean = self._mean_expect_jump
+        var = self._M2_expect_jump / (self.num_trajectories - 1)
+        return (1 - p) * mean, (1 - p) * (var + p * _abs2(mean))
 
     def _add_first_traj(self, trajectory):
         super()._add_first_traj(trajectory)
         if trajectory.states and self._store_average_density_matrices:
-            del self._sum_states
-            self._sum_states_no_jump = [
-                qzero_like(self._to_dm(state)) for state in trajectory.states
-            ]
-            self._sum_states_jump = [
-                qzero_like(self._to_dm(state)) for state in trajectory.states
-            ]
+            # The states are accumulated in the jump / no-jump sums instead.
+            self._sum_states = None
+            self._sum_states_no_jump = self._zeros_states(trajectory.states)
+            self._sum_states_jump = self._zeros_states(trajectory.states)
         if trajectory.final_state and self._store_final_density_matrix:
             state = trajectory.final_state
             del self._sum_final_states
             self._sum_final_states_no_jump = qzero_like(self._to_dm(state))
             self._sum_final_states_jump = qzero_like(self._to_dm(state))
-        self._sum_expect_jump = [
-            np.zeros_like(expect) for expect in trajectory.expect
-        ]
-        self._sum2_expect_jump = [
-            np.zeros_like(expect) for expect in trajectory.expect
-        ]
-        self._sum_expect_no_jump = [
-            np.zeros_like(expect) for expect in trajectory.expect
-        ]
-        self._sum2_expect_no_jump = [
-            np.zeros_like(expect) for expect in trajectory.expect
-        ]
-        self._sum_expect_jump = [
-            np.zeros_like(expect) for expect in trajectory.expect
-        ]
-        self._sum2_expect_jump = [
-            np.zeros_like(expect) for expect in trajectory.expect
-        ]
-        del self._sum_expect
-        del self._sum2_expect
+        self._expect_no_jump = np.zeros_like(self._mean_expect)
+        self._mean_expect_jump = np.zeros_like(self._mean_expect)
+        self._M2_expect_jump = np.zeros_like(self._M2_expect)
+        del self._mean_expect
+        del self._M2_expect
 
     def _reduce_expect(self, trajectory):
         """
-        Compute the average of the expectation values appropriately
-        weighting the jump and no-jump trajectories
-        """
-        for i, k in enumerate(self._raw_ops):
-            expect_traj = trajectory.expect[i]
-            p = self.no_jump_prob
-            if self.num_trajectories == 1:
-                self._sum_expect_no_jump[i] += expect_traj * p
-                self._sum2_expect_no_jump[i] += expect_traj**2 * p
-                # no jump trajectory will always be the first one, no need
-                # to worry about including jump trajectories
-                avg = self._sum_expect_no_jump[i]
-                avg2 = self._sum2_expect_no_jump[i]
-            else:
-                self._sum_expect_jump[i] += expect_traj * (1 - p)
-                self._sum2_expect_jump[i] += expect_traj**2 * (1 - p)
-                avg = self._sum_expect_no_jump[i] + (
-                    self._sum_expect_jump[i] / (self.num_trajectories - 1)
-                )
-                avg2 = self._sum2_expect_no_jump[i] + (
-                    self._sum2_expect_jump[i] / (self.num_trajectories - 1)
-                )
-
-            self.average_e_data[k] = list(avg)
-
-            # mean(expect**2) - mean(expect)**2 can something be very small
-            # negative (-1e-15) which raise an error for float sqrt.
-            self.std_e_data[k] = list(np.sqrt(np.abs(avg2 - np.abs(avg**2))))
+        Keep the expectation values of the no-jump trajectory and update the
+        running mean and sum of squared deviations of the jump trajectories.
+        The weights of both are applied when computing the statistics.
+        """
+        expect_traj = self._expect_array(trajectory)
+        if self.num_trajectories == 1:
+            self._expect_no_jump[...] = expect_traj
+        else:
+            _welford_update(
+                self._mean_expect_jump, self._M2_expect_jump,
+                expect_traj, self.num_trajectories - 1
+            )
+        self._expect_dirty = True
 
-            if self.runs_e_data:
+        if self.runs_e_data:
+            for k in self._raw_ops:
                 self.runs_e_data[k].append(trajectory.e_data[k])
 
+    def _expect_statistics(self):
+        """
+        Return the average and standard deviation of the expectation values
+        as arrays of shape ``(num_e_ops, num_times)``.
+        """
+        p = self.no_jump_prob
+        # The no-jump trajectory is always the first one: before any jump
+        # trajectory is added, the mean of the jump trajectories is zero.
+        mean_jump = self._mean_expect_jump
+        if self.num_trajectories == 1:
+            var_jump = 0.
+        else:
+            var_jump = self._M2_expect_jump / (self.num_trajectories - 1)
+        avg = p * self._expect_no_jump + (1 - p) * mean_jump
+        var = (1 - p) * (
+            var_jump + p * _abs2(self._expect_no_jump - mean_jump)
+        )
+        return avg, np.sqrt(var)
+
     @property
     def average_states(self):
         """
         States averages as density matrices.
         """
         if self._sum_states_no_jump is None:
-            if not (self.trajectories and self.trajectories[0].states):
+            trajectories = self.trajectories
+            if not (trajectories and trajectories[0].states):
                 return None
-            self._sum_states_no_jump = [
-                qzero_like(self._to_dm(state))
-                for state in self.trajectories[0].states
-            ]
-            self._sum_states_jump = [
-                qzero_like(self._to_dm(state))
-                for state in self.trajectories[0].states
-            ]
+            states = trajectories[0].states
+            self._sum_states_no_jump = self._zeros_states(states)
+            self._sum_states_jump = self._zeros_states(states)
             self.num_trajectories = 0
-            for trajectory in self.trajectories:
+            for trajectory in trajectories:
                 self.num_trajectories += 1
                 self._reduce_states(trajectory)
         p = self.no_jump_prob
-        return [
-            p * final_no_jump
-            + (1 - p) * final_jump / (self.num_trajectories - 1)
-            for final_no_jump, final_jump in zip(
-                self._sum_states_no_jump, self._sum_states_jump
-            )
-        ]
+        if isinstance(self._sum_states_no_jump, list):
+            return [
+                p * final_no_jump
+                + (1 - p) * final_jump / (self.num_trajectories - 1)
+                for final_no_jump, final_jump in zip(
+                    self._sum_states_no_jump, self._sum_states_jump
+                )
+            ]
+        return self._states_from_sum(
+            p * self._sum_states_no_jump
+            + (1 - p) / (self.num_trajectories - 1) * self._sum_states_jump,
+            1,
+        )
 
     @property
     def average_final_state(self):
@@ -1253,18 +1774,17 @@ class McResultImprovedSampling(McResult, MultiTrajResult):
         """
         Average photocurrent or measurement of the evolution.
         """
-        cols = [[] for _ in range(self.num_c_ops)]
-        tlist = self.times
-        for collapses in self.collapse:
-            for t, which in collapses:
-                cols[which].append(t)
-        mesurement = [
+        tlist = np.asarray(self.times)
+        counts = _count_collapses(
+            *self._all_collapses(), tlist, self.num_c_ops,
+            self._tlist_is_uniform()
+        )
+        scale = (
             (1 - self.no_jump_prob)
             / (self.num_trajectories - 1)
-            * np.histogram(cols[i], tlist)[0]
             / np.diff(tlist)
-            for i in range(self.num_c_ops)
-        ]
+        )
+        mesurement = list(counts * scale)
         return mesurement
 
 
@@ -1279,13 +1799,18 @@ class NmmcTrajectoryResult(McTrajectoryResult):
         self._nm_solver = kwargs.pop("__nm_solver")
         super().__init__(e_ops, options, *args, **kwargs)
         self.trace = []
+        # Whether states are kets, checked with the first state since it does
+        # not change along a trajectory.
+        self._state_is_ket = None
 
     # This gets called during the Monte-Carlo simulation of the associated
     # completely positive master equation. To obtain the state of the actual
     # system, we simply multiply the provided state with the current martingale
     # before storing it / computing expectation values.
     def add(self, t, state):
-        if isket(state):
+        if self._state_is_ket is None:
+            self._state_is_ket = isket(state)
+        if self._state_is_ket:
             state = ket2dm(state)
         mu = self._nm_solver.current_martingale()
         super().add(t, state * mu)
@@ -1333,40 +1858,142 @@ class NmmcResult(McResult):
     std_trace : list
         The standard deviation of the trace at each time.
 
-    runs_trace : list of lists
-        For each recorded trajectory, the trace at each time.
-        Only present if ``keep_runs_results`` is set in the options.
+    runs_trace : list or np.ndarray
+        For each recorded trajectory, the trace at each time, as an array of
+        shape ``(num_trajectories, len(times))``. Only present if
+        ``keep_runs_results`` is set in the options.
     """
 
     def _post_init(self):
         super()._post_init()
 
-        self._sum_trace = None
-        self._sum2_trace = None
-        self.average_trace = []
-        self.std_trace = []
-        self.runs_trace = []
+        self._trace_dtype = None
+        self._mean_trace = None
+        self._M2_trace = None
+        self._trace_buffers = None
+        self._runs_trace = None
+        self._num_runs_trace = 0
 
         self.add_processor(self._add_trace)
 
     def _add_first_traj(self, trajectory):
         super()._add_first_traj(trajectory)
-        self._sum_trace = np.zeros_like(trajectory.times)
-        self._sum2_trace = np.zeros_like(trajectory.times)
+        # Explicit dtypes: ``times`` and ``trace`` can be lists of any type.
+        # The precision can be lowered with the ``accumulator_dtype`` option.
+        self._trace_dtype = np.dtype(
+            np.complex128 if np.iscomplexobj(trajectory.trace) else np.float64
+        )
+        self._mean_trace = np.zeros(
+            len(trajectory.times),
+            dtype=self._accumulator_dtype(self._trace_dtype)
+        )
+        self._M2_trace = np.zeros(
+            len(trajectory.times),
+            dtype=self._accumulator_dtype(np.dtype(np.float64))
+        )
+        self._trace_buffers = self._new_trace_buffers(
+            self._mean_trace, self._M2_trace
+        )
+        if self.options["keep_runs_results"]:
+            # The traces of all runs are stored in one array, sized for the
+            # number of trajectories when it is fixed. With a target
+            # tolerance, fewer may be needed: the array starts small and
+            # grows as needed.
+            if self._early_finish_check == self._fixed_end:
+                num_runs = int(self._target_ntraj)
+            else:
+                num_runs = 1
+            self._runs_trace = np.empty(
+                (num_runs, len(trajectory.times)), dtype=self._trace_dtype
+            )
 
     def _add_trace(self, trajectory):
-        new_trace = np.array(trajectory.trace)
-        self._sum_trace += new_trace
-        self._sum2_trace += np.abs(new_trace) ** 2
+        new_trace = np.asarray(trajectory.trace, dtype=self._trace_dtype)
+        _update_trace(
+            self._mean_trace, self._M2_trace, new_trace,
+            self.num_trajectories, self._trace_buffers
+        )
 
-        avg = self._sum_trace / self.num_trajectories
-        avg2 = self._sum2_trace / self.num_trajectories
+        if self.options["keep_runs_results"]:
+            if self._num_runs_trace == self._runs_trace.shape[0]:
+                runs_trace = np.empty(
+                    (2 * self._num_runs_trace, self._runs_trace.shape[1]),
+                    dtype=self._runs_trace.dtype
+                )
+                runs_trace[:self._num_runs_trace] = self._runs_trace
+                self._runs_trace = runs_trace
+            self._runs_trace[self._num_runs_trace] = new_trace
+            self._num_runs_trace += 1
+
+    def _copy_into(self, new):
+        super()._copy_into(new)
+        new._trace_dtype = self._trace_dtype
+        new._mean_trace = _copy_accumulator(self._mean_trace)
+        new._M2_trace = _copy_accumulator(self._M2_trace)
+        new._trace_buffers = self._new_trace_buffers(
+            new._mean_trace, new._M2_trace
+        )
+        new._runs_trace = _copy_accumulator(self._runs_trace)
+        new._num_runs_trace = self._num_runs_trace
 
-        self.average_trace = avg
-        self.std_trace = np.sqrt(np.abs(avg2 - np.abs(avg) ** 2))
+    def _merge_into(self, new, other):
+        super()._merge_into(new, other)
+        new._trace_dtype = np.result_type(
+            self._trace_dtype, other._trace_dtype
+        )
+        # Same combination of the running means and squared deviations as
+        # for the expectation values.
+        delta = other._mean_trace - self._mean_trace
+        weight = other.num_trajectories / new.num_trajectories
+        new._mean_trace = self._mean_trace + delta * weight
+        new._M2_trace = (
+            self._M2_trace + other._M2_trace
+            + _abs2(delta) * self.num_trajectories * weight
+        )
+        new._trace_buffers = self._new_trace_buffers(
+            new._mean_trace, new._M2_trace
+        )
+        if self._runs_trace is not None and other._runs_trace is not None:
+            new._runs_trace = np.concatenate(
+                [self.runs_trace, other.runs_trace]
+            )
+            new._num_runs_trace = len(new._runs_trace)
 
-        if self.options["keep_runs_results"]:
-            self.runs_trace.append(trajectory.trace)
+    @staticmethod
+    def _new_trace_buffers(mean_trace, M2_trace):
+        if mean_trace is None:
+            return None
+        return np.empty_like(mean_trace), np.empty_like(M2_trace)
+
+    @property
+    def runs_trace(self):
+        """
+        For each recorded trajectory, the trace at each time.
+        """
+        if self._runs_trace is None:
+            return []
+        return self._runs_trace[:self._num_runs_trace]
+
+    @property
+    def average_trace(self):
+        """
+        The average trace (i.e., averaged over all trajectories) at each time.
+        """
+        if self._mean_trace is None:
+            return []
+        return self._mean_trace.astype(
+            np.result_type(self._mean_trace, np.float64)
+        )
+
+    @property
+    def std_trace(self):
+        """
+        The standard deviation of the trace at each time.
+        """
+        if self._M2_trace is None:
+            return []
+        M2 = self._M2_trace.astype(np.float64)
+        return np.sqrt(np.abs(M2 / self.num_trajectories))
 
     @property
     def trace(self):
@@ -1374,4 +2001,5 @@ class NmmcResult(McResult):
         Refers to ``average_trace`` or ``runs_trace``, depending on whether
         ``keep_runs_results`` is set in the options.
         """
-        return self.runs_trace or self.average_trace
+        runs_trace = self.runs_trace
+        return runs_trace if len(runs_trace) else self.average_trace
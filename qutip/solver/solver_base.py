@@ -158,6 +158,7 @@ class Solver:
         for t, state in self._integrator.run(tlist):
             progress_bar.update()
             results.add(t, self._restore_state(state, copy=False))
+        results._finalize()
         progress_bar.finished()
 
         stats['run time'] = progress_bar.total_time()
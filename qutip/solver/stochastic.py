@@ -87,6 +87,9 @@ class StochasticTrajResult(Result):
 
 
 class StochasticResult(MultiTrajResult):
+    # Trajectory attributes kept in lists when the runs are not stored.
+    _reduced_attrs = ("measurement", "dW", "wiener_process")
+
     def _post_init(self):
         super()._post_init()
 
@@ -111,6 +114,21 @@ class StochasticResult(MultiTrajResult):
         """
         getattr(self, "_" + attr).append(getattr(trajectory, attr))
 
+    def _copy_into(self, new):
+        super()._copy_into(new)
+        for attr in self._reduced_attrs:
+            if hasattr(self, "_" + attr):
+                setattr(new, "_" + attr, list(getattr(self, "_" + attr)))
+
+    def _merge_into(self, new, other):
+        super()._merge_into(new, other)
+        for attr in self._reduced_attrs:
+            if hasattr(self, "_" + attr) and hasattr(other, "_" + attr):
+                setattr(
+                    new, "_" + attr,
+                    getattr(self, "_" + attr) + getattr(other, "_" + attr)
+                )
+
     def _trajectories_attr(self, attr):
         """
         Get the result associated to the attr, whether the trajectories are
@@ -513,6 +531,7 @@ class StochasticSolver(MultiTrajSolver):
         "mpi_options": {},
         "num_cpus": None,
         "bitgenerator": None,
+        "accumulator_dtype": None,
         "method": "platen",
         "store_measurement": False,
     }
@@ -624,6 +643,7 @@ class StochasticSolver(MultiTrajSolver):
     def _integrate_one_traj(self, seed, tlist, result):
         for t, state, noise in self._integrator.run(tlist):
             result.add(t, self._restore_state(state, copy=False), noise)
+        result._finalize()
         return seed, result
 
     @classmethod
@@ -691,6 +711,12 @@ class StochasticSolver(MultiTrajSolver):
         bitgenerator: {None, "MT19937", "PCG64DXSM", ...}, default: None
             Which of numpy.random's bitgenerator to use. With ``None``, your
             numpy version's default is used.
+
+        accumulator_dtype: {None, numpy dtype}, default: None
+            Precision used to accumulate the average states and expectation
+            values over the trajectories, e.g. ``np.complex64`` for single
+            precision. With ``None``, the type of the trajectories' data is
+            used. The averages are returned in double precision.
         """
         return self._options
 
@@ -794,6 +820,7 @@ class SMESolver(StochasticSolver):
         "mpi_options": {},
         "num_cpus": None,
         "bitgenerator": None,
+        "accumulator_dtype": None,
         "method": "platen",
         "store_measurement": False,
     }
@@ -838,6 +865,7 @@ class SSESolver(StochasticSolver):
         "mpi_options": {},
         "num_cpus": None,
         "bitgenerator": None,
+        "accumulator_dtype": None,
         "method": "platen",
         "store_measurement": False,
     }
@@ -1,8 +1,22 @@
+import functools
+import operator
+
 import numpy as np
 import pytest
 
 import qutip
-from qutip.solver.result import Result, MultiTrajResult, McResult
+from qutip.solver.result import (
+    Result, MultiTrajResult, McResult, NmmcResult, NmmcTrajectoryResult,
+    _QobjExpectEop, _add_projector, _welford_update, _welford_update_numpy,
+    _count_collapses, _update_trace, _update_trace_numpy, _numba_kernels,
+    _is_uniform, _abs2,
+)
+
+if _numba_kernels() is not None:
+    _welford_update_numba = _numba_kernels().welford_update
+    _update_trace_numba = _numba_kernels().update_trace
+else:
+    _welford_update_numba = _update_trace_numba = None
 
 
 def fill_options(**kwargs):
@@ -19,6 +33,126 @@ def e_op_state_by_time(t, state):
     return t * state
 
 
+@pytest.mark.parametrize("op", [
+    pytest.param(qutip.num(5), id="herm"),
+    pytest.param(qutip.destroy(5), id="non-herm"),
+    pytest.param(qutip.rand_herm(5, dtype="dense"), id="dense"),
+])
+@pytest.mark.parametrize("state", [
+    pytest.param(qutip.rand_ket(5), id="ket"),
+    pytest.param(qutip.rand_dm(5), id="dm"),
+])
+def test_qobj_expect_eop(op, state):
+    e_op = _QobjExpectEop(op)
+    assert e_op(0, state) == qutip.expect(op, state)
+    assert type(e_op(0, state)) is type(qutip.expect(op, state))
+    with pytest.raises(ValueError):
+        e_op(0, qutip.rand_ket(4))
+
+
+def test_qobj_expect_eop_reused():
+    op = qutip.num(5)
+    res1 = Result([op], fill_options())
+    res2 = Result([op], fill_options())
+    assert res1.e_ops[0]._f is res2.e_ops[0]._f
+    res3 = Result([qutip.num(5)], fill_options())
+    assert res3.e_ops[0]._f is not res1.e_ops[0]._f
+
+
+@pytest.mark.parametrize("order", ["C", "F"])
+def test_add_projector(order):
+    ket = qutip.rand_ket(5).full().ravel()
+    dm = qutip.rand_dm(5).full(order=order)
+    expected = dm + np.outer(ket, ket.conj())
+    _add_projector(dm, ket)
+    np.testing.assert_allclose(dm, expected, atol=1e-14)
+
+
+@pytest.mark.parametrize("kernel", [
+    pytest.param(_welford_update, id="dispatch"),
+    pytest.param(_welford_update_numpy, id="numpy"),
+    pytest.param(
+        _welford_update_numba, id="numba",
+        marks=pytest.mark.skipif(
+            _welford_update_numba is None, reason="numba not installed"
+        ),
+    ),
+])
+@pytest.mark.parametrize("dtype", [np.float64, np.complex128, np.int64])
+def test_welford_update(dtype, kernel):
+    samples = (np.random.rand(6, 3, 4) * 10).astype(dtype)
+    if np.iscomplexobj(samples):
+        samples += 1j * np.random.rand(6, 3, 4)
+    mean = np.zeros((3, 4), dtype=np.result_type(dtype, np.float64))
+    M2 = np.zeros((3, 4))
+    for n, x in enumerate(samples, 1):
+        kernel(mean, M2, x, n)
+    np.testing.assert_allclose(mean, np.mean(samples, axis=0))
+    np.testing.assert_allclose(M2 / len(samples), np.var(samples, axis=0))
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.complex128])
+def test_abs2(dtype):
+    x = np.random.randn(5).astype(dtype)
+    if np.iscomplexobj(x):
+        x += 1j * np.random.randn(5)
+    out = np.empty(5)
+    assert _abs2(x, out=out) is out
+    np.testing.assert_allclose(out, np.abs(x)**2)
+    np.testing.assert_allclose(_abs2(x), np.abs(x)**2)
+
+
+@pytest.mark.parametrize("kernel", [
+    pytest.param(_update_trace, id="dispatch"),
+    pytest.param(_update_trace_numpy, id="numpy"),
+    pytest.param(
+        _update_trace_numba, id="numba",
+        marks=pytest.mark.skipif(
+            _update_trace_numba is None, reason="numba not installed"
+        ),
+    ),
+])
+@pytest.mark.parametrize("dtype", [np.float64, np.complex128])
+def test_update_trace(dtype, kernel):
+    if kernel is _update_trace_numba and dtype is np.complex128:
+        pytest.skip("the numba kernel only supports real traces")
+    traces = np.random.rand(6, 4).astype(dtype)
+    if np.iscomplexobj(traces):
+        traces += 1j * np.random.rand(6, 4)
+    mean = np.zeros(4, dtype=dtype)
+    M2 = np.zeros(4)
+    buffers = np.empty_like(mean), np.empty_like(M2)
+    for n, trace in enumerate(traces, 1):
+        if kernel is _update_trace_numba:
+            kernel(mean, M2, trace, n)
+        else:
+            kernel(mean, M2, trace, n, buffers)
+    np.testing.assert_allclose(mean, np.mean(traces, axis=0))
+    np.testing.assert_allclose(np.sqrt(M2 / 6), np.std(traces, axis=0))
+
+
+@pytest.mark.parametrize(["tlist", "uniform"], [
+    pytest.param(np.linspace(0, 1, 11), True, id="uniform"),
+    pytest.param(np.linspace(0, 1, 11)**2, False, id="non-uniform"),
+])
+def test_count_collapses(tlist, uniform):
+    assert _is_uniform(tlist) == uniform
+    times = np.concatenate([
+        np.random.rand(50) * 1.2 - 0.1, tlist, [0.5, 0.5]
+    ])
+    which = np.random.randint(2, size=len(times))
+    counts = _count_collapses(times, which, tlist, 2, uniform)
+    assert counts.shape == (2, len(tlist) - 1)
+    for i, count in enumerate(counts):
+        np.testing.assert_array_equal(
+            count, np.histogram(times[which == i], tlist)[0]
+        )
+    single = _count_collapses(
+        times[which == 0], which[which == 0], tlist, 1, uniform
+    )
+    np.testing.assert_array_equal(single, counts[:1])
+
+
 class TestResult:
     @pytest.mark.parametrize(["N", "e_ops", "options"], [
         pytest.param(10, (), {}, id="no-e-ops"),
@@ -50,6 +184,28 @@ class TestResult:
         assert res.states == []
         assert res.final_state == qutip.basis(N, N-1)
 
+    def test_states_and_final_state(self):
+        N = 5
+        res = Result([], fill_options(store_final_state=True,
+                                      store_states=True))
+        assert len(res._state_processors) == 1
+        for i in range(N):
+            res.add(i, qutip.basis(N, i))
+        assert res.final_state is res.states[-1]
+
+    def test_final_state_copied_on_finalize(self):
+        N = 5
+        res = Result([], fill_options(store_final_state=True,
+                                      store_states=False))
+        assert not res._state_processors_require_copy
+        state = qutip.basis(N, 0)
+        for i in range(N):
+            res.add(i, state)
+        assert res.final_state is state
+        res._finalize()
+        assert res.final_state is not state
+        assert res.final_state == state
+
     @pytest.mark.parametrize(["N", "e_ops", "results"], [
         pytest.param(
             10, qutip.num(10), {0: np.arange(10)}, id="single-e-op",
@@ -107,6 +263,43 @@ class TestResult:
                 np.testing.assert_allclose(res.e_data[k], results[k])
                 np.testing.assert_allclose(e_op_call_values, results[k])
 
+    def test_e_data_assignable(self):
+        N = 10
+        res = Result(
+            [qutip.num(N), qutip.destroy(N)], fill_options(store_states=False)
+        )
+        for i in range(N):
+            res.add(i, qutip.basis(N, i))
+        assert res.e_data is res.e_data
+        np.testing.assert_allclose(res.expect[0], np.arange(N))
+        assert not np.iscomplexobj(res.expect[0])
+        assert np.iscomplexobj(res.expect[1])
+        res.e_data[0] = list(range(N, 0, -1))
+        np.testing.assert_allclose(res.expect[0], np.arange(N, 0, -1))
+        res.e_data = {"a": [1, 2]}
+        np.testing.assert_allclose(res.expect[0], [1, 2])
+
+    @pytest.mark.parametrize("dm", [True, False])
+    def test_qobj_e_ops(self, dm):
+        N = 5
+        e_ops = {
+            "num": qutip.num(N),
+            "a": qutip.destroy(N),
+            "dense": qutip.rand_herm(N, dtype="dense"),
+            "func": e_op_num,
+        }
+        res = Result(e_ops, fill_options(store_states=False))
+        states = [qutip.rand_dm(N) if dm else qutip.rand_ket(N)
+                  for _ in range(3)]
+        for i, state in enumerate(states):
+            res.add(i, state)
+        for k, op in e_ops.items():
+            if k == "func":
+                continue
+            expected = [qutip.expect(op, state) for state in states]
+            np.testing.assert_allclose(res.e_data[k], expected, atol=1e-14)
+            assert np.iscomplexobj(res.e_data[k]) == (k == "a")
+
     def test_add_processor(self):
         res = Result([], fill_options(store_states=False))
         a = []
@@ -188,6 +381,18 @@ class TestMultiTrajResult:
             if multiresult.add((0, result)) <= 0:
                 break
 
+    def _trace_trajectories(self, multiresult, traces):
+        # One trajectory of basis states for each trace, as seed and result.
+        trajectories = []
+        for i, trace in enumerate(traces):
+            result = Result(multiresult._raw_ops, multiresult.options)
+            result.collapse = []
+            for t in range(len(trace)):
+                result.add(t, qutip.basis(len(trace), t))
+            result.trace = list(trace)
+            trajectories.append((i, result))
+        return trajectories
+
     def _expect_check_types(self, multiresult):
         assert isinstance(multiresult.std_expect, list)
         assert isinstance(multiresult.average_e_data, dict)
@@ -220,9 +425,136 @@ class TestMultiTrajResult:
         assert np.all(np.array(m_res.col_which) < 2)
         assert isinstance(m_res.collapse, list)
         assert len(m_res.col_which[0]) == len(m_res.col_times[0])
+        assert m_res.col_times[0] == [t for t, _ in m_res.collapse[0]]
+        assert m_res.col_which[0] == [w for _, w in m_res.collapse[0]]
         np.testing.assert_allclose(m_res.photocurrent[0], np.ones(N-1))
         np.testing.assert_allclose(m_res.photocurrent[1], 2 * np.ones(N-1))
 
+    def test_NmmcResult_trace_single_precision(self):
+        N = 5
+        opt = fill_options(
+            keep_runs_results=True, accumulator_dtype=np.float32
+        )
+        m_res = NmmcResult([], opt, stats={"num_collapse": 0})
+        traces = 1 + 0.1 * np.random.randn(4, N)
+        for trajectory in self._trace_trajectories(m_res, traces):
+            m_res.add(trajectory)
+        assert m_res._mean_trace.dtype == np.float32
+        assert m_res.average_trace.dtype == np.float64
+        assert m_res.std_trace.dtype == np.float64
+        np.testing.assert_allclose(
+            m_res.average_trace, traces.mean(axis=0), rtol=1e-5
+        )
+        np.testing.assert_allclose(
+            m_res.std_trace, traces.std(axis=0), rtol=1e-3
+        )
+        np.testing.assert_array_equal(m_res.runs_trace, traces)
+
+    @pytest.mark.parametrize('keep_runs_results', [True, False])
+    def test_NmmcResult_merge_trace(self, keep_runs_results):
+        N = 5
+        opt = fill_options(keep_runs_results=keep_runs_results)
+        stats = {"num_collapse": 0, "run time": 0}
+        traces = 1 + 0.1 * np.random.randn(7, N)
+        m_res = NmmcResult([], opt, stats=stats)
+        trajectories = self._trace_trajectories(m_res, traces)
+        m_res.add_batch(trajectories[:5], num_threads=2)
+        m_res.add(trajectories[5])
+        m_res.add_batch(trajectories[6:], num_threads=2)
+        np.testing.assert_allclose(m_res.average_trace, traces.mean(axis=0))
+        np.testing.assert_allclose(m_res.std_trace, traces.std(axis=0))
+        if keep_runs_results:
+            np.testing.assert_allclose(m_res.runs_trace, traces)
+
+    @pytest.mark.parametrize('dm', [True, False])
+    def test_NmmcTrajectoryResult_trace(self, dm):
+        class Martingale:
+            mu = 1.
+
+            def current_martingale(self):
+                self.mu *= 0.5
+                return self.mu
+
+        N = 5
+        result = NmmcTrajectoryResult(
+            [qutip.num(N)], fill_options(), __nm_solver=Martingale()
+        )
+        for t in range(N):
+            state = qutip.basis(N, t)
+            result.add(t, state.proj() if dm else state)
+        np.testing.assert_allclose(result.trace, 0.5 ** np.arange(1, N + 1))
+        np.testing.assert_allclose(
+            result.expect[0], np.arange(N) * 0.5 ** np.arange(1, N + 1)
+        )
+
+        result.trace = [1.] * N
+        np.testing.assert_allclose(result.trace, np.ones(N))
+
+    @pytest.mark.parametrize('keep_runs_results', [True, False])
+    def test_NmmcResult_trace(self, keep_runs_results):
+        N = 5
+        opt = fill_options(keep_runs_results=keep_runs_results)
+        m_res = NmmcResult([], opt, stats={"num_collapse": 0})
+        assert m_res.average_trace == []
+        assert len(m_res.trace) == 0
+        traces = 1 + 0.1 * np.random.randn(4, N)
+        for trajectory in self._trace_trajectories(m_res, traces):
+            m_res.add(trajectory)
+        assert m_res.average_trace.dtype == np.float64
+        np.testing.assert_allclose(m_res.average_trace, traces.mean(axis=0))
+        np.testing.assert_allclose(m_res.std_trace, traces.std(axis=0))
+        # The statistics are only computed when read.
+        assert "average_trace" not in vars(m_res)
+        assert "std_trace" not in vars(m_res)
+        m_res.average_trace[:] = 0
+        np.testing.assert_allclose(m_res.average_trace, traces.mean(axis=0))
+        if keep_runs_results:
+            assert m_res.runs_trace.shape == (4, N)
+            assert isinstance(m_res.trace, np.ndarray)
+            np.testing.assert_allclose(m_res.trace, traces)
+        else:
+            np.testing.assert_allclose(m_res.trace, traces.mean(axis=0))
+
+    @pytest.mark.parametrize("target_tol", [None, 0.1])
+    def test_NmmcResult_runs_trace_capacity(self, target_tol):
+        N = 5
+        ntraj = 1000
+        opt = fill_options(keep_runs_results=True)
+        m_res = NmmcResult([qutip.num(N)], opt, stats={"num_collapse": 0})
+        m_res.add_end_condition(ntraj, target_tol)
+        for trajectory in self._trace_trajectories(m_res, np.ones((3, N))):
+            m_res.add(trajectory)
+        # The storage is only sized for ``ntraj`` when it is the end
+        # condition: with a tolerance, far fewer runs may be needed.
+        if target_tol is None:
+            assert len(m_res._runs_trace) == ntraj
+        else:
+            assert len(m_res._runs_trace) < 16
+        assert m_res.runs_trace.shape == (3, N)
+        np.testing.assert_allclose(m_res.runs_trace, 1.)
+
+    def test_McResult_merge_collapses(self):
+        N = 5
+        opt = fill_options()
+        stats = {"num_collapse": 2, "run time": 0}
+        first = McResult([qutip.num(N)], opt, stats=stats.copy())
+        self._fill_trajectories(first, N, 2, collapse=True)
+        second = McResult([qutip.num(N)], opt, stats=stats.copy())
+        self._fill_trajectories(second, N, 3)
+        merged = first + second
+        assert len(merged.collapse) == 5
+        assert merged.col_times == first.col_times + second.col_times
+        assert merged.col_which == first.col_which + second.col_which
+        np.testing.assert_allclose(
+            merged.photocurrent[1], np.array(first.photocurrent[1]) * 2 / 5
+        )
+
+        col_times = first.col_times
+        assert first.col_times is col_times
+        self._fill_trajectories(first, N, 1, collapse=True)
+        assert len(first.col_times) == 3
+        assert len(first.col_which) == 3
+
     @pytest.mark.parametrize('keep_runs_results', [True, False])
     @pytest.mark.parametrize(["e_ops", "results"], [
         pytest.param(qutip.num(5), [np.arange(5)], id="single-e-op"),
@@ -264,6 +596,119 @@ class TestMultiTrajResult:
 
         assert m_res.stats['end_condition'] == "unknown"
 
+    def test_multitraj_expect_updated_on_add(self):
+        N = 5
+        m_res = MultiTrajResult([qutip.num(N)], fill_options(), stats={})
+        self._fill_trajectories(m_res, N, 2)
+        average = m_res.average_e_data
+        assert m_res.average_e_data is average
+        np.testing.assert_allclose(average[0], np.arange(N))
+
+        result = Result(m_res._raw_ops, m_res.options)
+        for t in range(N):
+            result.add(t, qutip.basis(N, 0))
+        m_res.add((0, result))
+        assert m_res.average_e_data is not average
+        assert isinstance(m_res.average_e_data[0], np.ndarray)
+        np.testing.assert_allclose(
+            m_res.average_e_data[0], np.arange(N) * 2 / 3
+        )
+        np.testing.assert_allclose(average[0], np.arange(N))
+
+    def test_multitraj_expect_statistics(self):
+        N = 5
+        opt = fill_options(keep_runs_results=True)
+        m_res1 = MultiTrajResult(
+            [qutip.num(N)], opt, stats={"run time": 0}
+        )
+        self._fill_trajectories(m_res1, N, 7, noise=0.1)
+        m_res2 = MultiTrajResult(
+            [qutip.num(N)], opt, stats={"run time": 0}
+        )
+        self._fill_trajectories(m_res2, N, 4, noise=0.5)
+
+        for m_res in [m_res1, m_res2, m_res1 + m_res2]:
+            runs = np.array(m_res.runs_e_data[0])
+            np.testing.assert_allclose(
+                m_res.average_e_data[0], np.mean(runs, axis=0)
+            )
+            np.testing.assert_allclose(
+                m_res.std_e_data[0], np.std(runs, axis=0), atol=1e-14
+            )
+
+    def test_multitraj_expect_statistics_complex(self):
+        # The standard deviation of non-hermitian e_ops is ``np.std``, the
+        # square root of the mean of ``|expect - average|**2``.
+        N = 3
+        opt = fill_options(keep_runs_results=True)
+        results = []
+        for ntraj in [3, 4]:
+            m_res = MultiTrajResult(
+                [qutip.destroy(N)], opt, stats={"run time": 0}
+            )
+            for _ in range(ntraj):
+                result = Result([qutip.destroy(N)], opt)
+                for t in range(2):
+                    result.add(t, qutip.rand_ket(N))
+                m_res.add((0, result))
+            results.append(m_res)
+
+        for m_res in results + [results[0] + results[1]]:
+            runs = np.array(m_res.runs_e_data[0])
+            assert np.iscomplexobj(runs)
+            np.testing.assert_allclose(
+                m_res.average_e_data[0], np.mean(runs, axis=0)
+            )
+            assert not np.iscomplexobj(m_res.std_e_data[0])
+            np.testing.assert_allclose(
+                m_res.std_e_data[0], np.std(runs, axis=0)
+            )
+
+    @pytest.mark.parametrize('dm', [True, False])
+    def test_multitraj_average_states(self, dm):
+        N = 4
+        m_res = MultiTrajResult([], fill_options())
+        states = []
+        for _ in range(3):
+            result = Result([], fill_options(store_states=True))
+            traj = [qutip.rand_dm(N) if dm else qutip.rand_ket(N)
+                    for _ in range(2)]
+            for t, state in enumerate(traj):
+                result.add(t, state)
+            m_res.add((0, result))
+            states.append([state if dm else state.proj() for state in traj])
+
+        for t, average in enumerate(m_res.average_states):
+            expected = sum(traj[t] for traj in states) / 3
+            assert average.dims == [[N], [N]]
+            np.testing.assert_allclose(
+                average.full(), expected.full(), atol=1e-14
+            )
+
+    @pytest.mark.parametrize('kind', ["operator-ket", "non-square"])
+    def test_multitraj_average_other_states(self, kind):
+        # States that are not kets nor square operators are summed as Qobj.
+        m_res = MultiTrajResult([], fill_options())
+        states = []
+        for _ in range(3):
+            result = Result([], fill_options(store_states=True))
+            if kind == "operator-ket":
+                traj = [qutip.operator_to_vector(qutip.rand_dm(2))
+                        for _ in range(2)]
+            else:
+                traj = [qutip.Qobj(np.random.rand(3, 2)) for _ in range(2)]
+            for t, state in enumerate(traj):
+                result.add(t, state)
+            m_res.add((0, result))
+            states.append(traj)
+
+        for t, average in enumerate(m_res.average_states):
+            expected = sum(traj[t] for traj in states) / 3
+            assert average.dims == expected.dims
+            np.testing.assert_allclose(
+                average.full(), expected.full(), atol=1e-14
+            )
+
     @pytest.mark.parametrize('keep_runs_results', [True, False])
     @pytest.mark.parametrize('dm', [True, False])
     def test_multitraj_state(self, keep_runs_results, dm):
@@ -317,6 +762,16 @@ class TestMultiTrajResult:
         assert m_res.stats['end_condition'] == "timeout"
         assert m_res.steady_state() == qutip.qeye(5) / 5
 
+    @pytest.mark.parametrize('keep_runs_results', [True, False])
+    def test_multitraj_steadystate_last_states(self, keep_runs_results):
+        N = 5
+        opt = fill_options(keep_runs_results=keep_runs_results)
+        m_res = MultiTrajResult([], opt, stats={})
+        self._fill_trajectories(m_res, N, 10)
+        expected = (qutip.fock_dm(N, N-2) + qutip.fock_dm(N, N-1)) / 2
+        assert m_res.steady_state(2) == expected
+        assert m_res.steady_state(2) == expected
+
     @pytest.mark.parametrize('keep_runs_results', [True, False])
     def test_repr(self, keep_runs_results):
         N = 10
@@ -352,3 +807,145 @@ class TestMultiTrajResult:
         )
         assert bool(merged_res.trajectories) == keep_runs_results
         assert merged_res.stats["run time"] == 3
+
+    def test_merge_partial_results(self):
+        N = 5
+        opt = fill_options(store_states=True)
+        m_res = MultiTrajResult(
+            [qutip.num(N)], opt, stats={"run time": 0}
+        )
+        partials = [m_res.partial_result() for _ in range(3)]
+        np.random.seed(1)
+        for i in range(8):
+            result = Result(m_res._raw_ops, opt)
+            for t in range(N):
+                result.add(t, qutip.rand_ket(N))
+            m_res.add((i, result))
+            # The last partial result stays empty.
+            partials[i % 2].add((i, result))
+
+        merged = functools.reduce(operator.add, partials)
+        assert merged.num_trajectories == m_res.num_trajectories
+        np.testing.assert_allclose(
+            merged.average_e_data[0], m_res.average_e_data[0]
+        )
+        np.testing.assert_allclose(
+            merged.std_e_data[0], m_res.std_e_data[0], atol=1e-14
+        )
+        for merged_state, state in zip(
+            merged.average_states, m_res.average_states
+        ):
+            np.testing.assert_allclose(
+                merged_state.full(), state.full(), atol=1e-14
+            )
+
+    @pytest.mark.parametrize('keep_runs_results', [True, False])
+    def test_add_batch(self, keep_runs_results):
+        N = 5
+        ntraj = 10
+        opt = fill_options(
+            store_states=True, keep_runs_results=keep_runs_results
+        )
+        stats = {"num_collapse": 2, "run time": 0}
+        np.random.seed(1)
+        trajectories = []
+        for i in range(ntraj):
+            result = Result([qutip.num(N)], opt)
+            result.collapse = [(i * 0.1, i % 2)]
+            for t in range(N):
+                result.add(t, qutip.rand_ket(N))
+            trajectories.append((i, result))
+
+        serial = McResult([qutip.num(N)], opt, stats=stats.copy())
+        serial.add_end_condition(ntraj)
+        for trajectory in trajectories:
+            serial.add(trajectory)
+        batch = McResult([qutip.num(N)], opt, stats=stats.copy())
+        batch.add_end_condition(ntraj)
+        assert batch.add_batch(trajectories[:3], num_threads=2) == 7
+        assert batch.add_batch(trajectories[3:], num_threads=3) == 0
+
+        assert batch.num_trajectories == ntraj
+        assert batch.stats["end_condition"] == "ntraj reached"
+        assert batch.seeds == serial.seeds
+        assert batch.col_times == serial.col_times
+        np.testing.assert_allclose(
+            batch.average_e_data[0], serial.average_e_data[0]
+        )
+        np.testing.assert_allclose(
+            batch.std_e_data[0], serial.std_e_data[0], atol=1e-14
+        )
+        for batch_state, state in zip(
+            batch.average_states, serial.average_states
+        ):
+            np.testing.assert_allclose(
+                batch_state.full(), state.full(), atol=1e-14
+            )
+        if keep_runs_results:
+            assert batch.trajectories == serial.trajectories
+
+    def test_add_batch_default_stats(self):
+        N = 5
+        opt = fill_options()
+        trajectories = []
+        for i in range(4):
+            result = Result([qutip.num(N)], opt)
+            for t in range(N):
+                result.add(t, qutip.basis(N, t))
+            trajectories.append((i, result))
+
+        m_res = MultiTrajResult([qutip.num(N)], opt)
+        assert m_res.add_batch(trajectories, num_threads=2) == np.inf
+        assert m_res.num_trajectories == 4
+        # Merging does not change the stats of the merged results.
+        assert m_res.stats == {"end_condition": "unknown"}
+        np.testing.assert_allclose(m_res.average_e_data[0], np.arange(N))
+
+        first = MultiTrajResult([qutip.num(N)], opt)
+        first.add(trajectories[0])
+        merged = first + m_res
+        assert merged.stats["end_condition"] == "Merged results"
+        assert merged.stats["run time"] == 0
+        assert first.stats == {"end_condition": "unknown"}
+
+    @pytest.mark.parametrize('dtype', [np.complex64, np.float32])
+    def test_accumulator_dtype(self, dtype):
+        N = 5
+        e_ops = [qutip.num(N), qutip.destroy(N)]
+        opt = fill_options(store_states=True)
+        m_res = MultiTrajResult(e_ops, opt, stats={})
+        self._fill_trajectories(m_res, N, 10, noise=0.1)
+        opt_single = fill_options(store_states=True, accumulator_dtype=dtype)
+        m_res_single = MultiTrajResult(e_ops, opt_single, stats={})
+        self._fill_trajectories(m_res_single, N, 10, noise=0.1)
+
+        assert m_res_single._sum_states.dtype == np.complex64
+        assert m_res_single._mean_expect.dtype == np.complex64
+        for k in [0, 1]:
+            average = np.array(m_res_single.average_e_data[k])
+            expected = np.array(m_res.average_e_data[k])
+            assert average.dtype == expected.dtype
+            np.testing.assert_allclose(average, expected, rtol=1e-6)
+        for state, expected in zip(
+            m_res_single.average_states, m_res.average_states
+        ):
+            np.testing.assert_allclose(
+                state.full(), expected.full(), atol=1e-6
+            )
+
+    def test_seeds_and_trajectories(self):
+        N = 5
+        opt = fill_options(keep_runs_results=True)
+        m_res = MultiTrajResult([qutip.num(N)], opt, stats={})
+        m_res.add_end_condition(5)
+        for i in range(3):
+            result = Result(m_res._raw_ops, opt)
+            result.add(0, qutip.basis(N, i))
+            m_res.add((i, result))
+        assert m_res.seeds == [0, 1, 2]
+        assert len(m_res.trajectories) == 3
+        assert len(m_res.runs_e_data[0]) == 3
+        # Plain lists: edits in place are kept.
+        m_res.seeds.append(3)
+        assert m_res.seeds == [0, 1, 2, 3]
+        assert m_res.trajectories is m_res.trajectories
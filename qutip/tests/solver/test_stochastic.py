@@ -4,7 +4,9 @@ from qutip import (
     mesolve, liouvillian, QobjEvo, spre, spost,
     destroy, coherent, qeye, fock_dm, num, basis
 )
-from qutip.solver.stochastic import smesolve, ssesolve, SMESolver, SSESolver
+from qutip.solver.stochastic import (
+    smesolve, ssesolve, SMESolver, SSESolver, StochasticResult
+)
 from qutip.core import data as _data
 
 
@@ -280,6 +282,32 @@ def test_reuse_seeds():
         assert out1 == out2
 
 
+def test_merge_measurement():
+    N = 4
+    ntraj = 6
+    a = destroy(N)
+    options = {
+        "store_measurement": True, "keep_runs_results": True, "map": "serial"
+    }
+    res = smesolve(
+        num(N), fock_dm(N, 1), np.linspace(0, 1, 11), sc_ops=[a],
+        e_ops=[num(N)], ntraj=ntraj, options=options
+    )
+
+    # Without the runs, the measurements are reduced in lists which must be
+    # carried when the partial results are merged.
+    options = dict(res.options)
+    options["keep_runs_results"] = False
+    batch = StochasticResult([num(N)], options, stats={"run time": 0})
+    batch.add_end_condition(ntraj)
+    assert batch.add_batch(
+        list(zip(res.seeds, res.trajectories)), num_threads=3
+    ) == 0
+    np.testing.assert_allclose(batch.measurement, res.measurement)
+    np.testing.assert_allclose(batch.dW, res.dW)
+    np.testing.assert_allclose(batch.wiener_process, res.wiener_process)
+
+
 @pytest.mark.parametrize("heterodyne", [True, False])
 def test_m_ops(heterodyne):
     N = 10
@@ -50,3 +50,15 @@ def test_ttmsolve_jc_model(call):
 
     # check that ttm result and exact solution are close in the learning times
     assert np.allclose(ttmsol.expect[0], exactsol.expect[0], atol=1e-5)
+
+
+def test_ttmsolve_final_state():
+    rho0 = qutip.rand_dm(2)
+    dynmaps = [qutip.to_super(qutip.qeye(2))] * 2
+    ttmsol = ttmsolve(
+        dynmaps, rho0, [0., 0.1], options={"store_final_state": True}
+    )
+    # The final state is copied when the evolution is finalized: it must not
+    # be the caller's state.
+    assert ttmsol.final_state is not rho0
+    assert ttmsol.final_state == rho0